@@ -11,61 +11,81 @@ and other potentially affected fields.
 
 import json
 from decimal import Decimal
-from unittest.mock import Mock
+from unittest.mock import NonCallableMagicMock
 
 import pytest
+from idp_common.dynamodb.client import DynamoDBClient
 from idp_common.dynamodb.service import DocumentDynamoDBService
 from idp_common.models import Status
 
 
-class TestDynamoDBServiceDataFormats:
-    """Test suite for DynamoDB data format conversion issues."""
+@pytest.fixture(scope="module")
+def service():
+    """DocumentDynamoDBService backed by a mock client, shared across the module.
+
+    Only the item-to-document conversion is exercised here, which never touches
+    the client, so a single instance is safe to reuse. The spec_set mock rejects
+    any attribute DynamoDBClient does not define.
+    """
+    return DocumentDynamoDBService(
+        dynamodb_client=NonCallableMagicMock(spec_set=DynamoDBClient)
+    )
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        # Mock the DynamoDBClient
-        self.mock_client = Mock()
-        self.service = DocumentDynamoDBService(dynamodb_client=self.mock_client)
 
-    def create_base_dynamodb_item(self):
-        """Create a base DynamoDB item structure for testing."""
-        return {
-            "PK": "doc#lending_package.pdf",
+@pytest.fixture
+def make_dynamodb_item():
+    """Factory for the DynamoDB document items fed to the conversion tests."""
+
+    def _make(object_key="lending_package.pdf", page_count=6, include_content=True):
+        item = {
+            "PK": f"doc#{object_key}",
             "SK": "none",
-            "ObjectKey": "lending_package.pdf",
+            "ObjectKey": object_key,
             "ObjectStatus": "COMPLETED",
-            "PageCount": 6,
-            "QueuedTime": "2025-09-25T14:14:54.819Z",
-            "WorkflowStartTime": "2025-09-25T14:15:00.000Z",
-            "CompletionTime": "2025-09-25T14:16:30.000Z",
-            "Pages": [
-                {
-                    "Id": 1,
-                    "Class": "W2",
-                    "ImageUri": "s3://bucket/page1.jpg",
-                    "TextUri": "s3://bucket/page1.json",
-                },
-                {
-                    "Id": 2,
-                    "Class": "Bank Statement",
-                    "ImageUri": "s3://bucket/page2.jpg",
-                    "TextUri": "s3://bucket/page2.json",
-                },
-            ],
-            "Sections": [
+            "PageCount": page_count,
+        }
+        if include_content:
+            item.update(
                 {
-                    "Id": "1",
-                    "Class": "W2",
-                    "PageIds": [1],
-                    "OutputJSONUri": "s3://bucket/section1.json",
+                    "QueuedTime": "2025-09-25T14:14:54.819Z",
+                    "WorkflowStartTime": "2025-09-25T14:15:00.000Z",
+                    "CompletionTime": "2025-09-25T14:16:30.000Z",
+                    "Pages": [
+                        {
+                            "Id": 1,
+                            "Class": "W2",
+                            "ImageUri": "s3://bucket/page1.jpg",
+                            "TextUri": "s3://bucket/page1.json",
+                        },
+                        {
+                            "Id": 2,
+                            "Class": "Bank Statement",
+                            "ImageUri": "s3://bucket/page2.jpg",
+                            "TextUri": "s3://bucket/page2.json",
+                        },
+                    ],
+                    "Sections": [
+                        {
+                            "Id": "1",
+                            "Class": "W2",
+                            "PageIds": [1],
+                            "OutputJSONUri": "s3://bucket/section1.json",
+                        }
+                    ],
                 }
-            ],
-        }
+            )
+        return item
 
-    def test_metering_as_native_dict_causes_error(self):
+    return _make
+
+
+class TestDynamoDBServiceDataFormats:
+    """Test suite for DynamoDB data format conversion issues."""
+
+    def test_metering_as_native_dict_causes_error(self, service, make_dynamodb_item):
         """Test that reproduces the exact error: metering as native dict causes json.loads() to fail."""
         # This reproduces the exact error from the stack trace
-        mock_item = self.create_base_dynamodb_item()
+        mock_item = make_dynamodb_item()
         mock_item["Metering"] = {
             "tokens_used": 150,
             "processing_cost": Decimal("0.05"),
@@ -76,56 +96,58 @@ class TestDynamoDBServiceDataFormats:
         with pytest.raises(
             TypeError, match="the JSON object must be str, bytes or bytearray, not dict"
         ):
-            self.service._dynamodb_item_to_document(mock_item)
+            service._dynamodb_item_to_document(mock_item)
 
-    def test_metering_as_json_string_works(self):
+    def test_metering_as_json_string_works(self, service, make_dynamodb_item):
         """Test that metering as JSON string works correctly."""
-        mock_item = self.create_base_dynamodb_item()
+        mock_item = make_dynamodb_item()
         metering_data = {"tokens_used": 150, "processing_cost": 0.05, "model_calls": 3}
         mock_item["Metering"] = json.dumps(metering_data)
 
         # This should work without errors
-        document = self.service._dynamodb_item_to_document(mock_item)
+        document = service._dynamodb_item_to_document(mock_item)
 
         assert document.metering == metering_data
         assert document.metering["tokens_used"] == 150
         assert document.metering["processing_cost"] == 0.05
 
-    def test_metering_null_or_missing(self):
+    def test_metering_null_or_missing(self, service, make_dynamodb_item):
         """Test handling of null or missing metering data."""
-        mock_item = self.create_base_dynamodb_item()
+        mock_item = make_dynamodb_item()
 
         # Test with None
         mock_item["Metering"] = None
-        document = self.service._dynamodb_item_to_document(mock_item)
+        document = service._dynamodb_item_to_document(mock_item)
         assert document.metering == {}
 
         # Test with missing field
         del mock_item["Metering"]
-        document = self.service._dynamodb_item_to_document(mock_item)
+        document = service._dynamodb_item_to_document(mock_item)
         assert document.metering == {}
 
-    def test_metering_empty_string(self):
+    def test_metering_empty_string(self, service, make_dynamodb_item):
         """Test handling of empty string metering data."""
-        mock_item = self.create_base_dynamodb_item()
+        mock_item = make_dynamodb_item()
         mock_item["Metering"] = ""
 
-        document = self.service._dynamodb_item_to_document(mock_item)
+        document = service._dynamodb_item_to_document(mock_item)
         assert document.metering == {}
 
-    def test_metering_malformed_json_string(self):
+    def test_metering_malformed_json_string(self, service, make_dynamodb_item):
         """Test handling of malformed JSON string in metering."""
-        mock_item = self.create_base_dynamodb_item()
+        mock_item = make_dynamodb_item()
         mock_item["Metering"] = '{"invalid": json, "missing": quote}'
 
         # Should handle gracefully without crashing
-        document = self.service._dynamodb_item_to_document(mock_item)
+        document = service._dynamodb_item_to_document(mock_item)
         # Should fall back to empty dict or log warning
         assert document.metering == {}
 
-    def test_complete_document_conversion_with_mixed_formats(self):
+    def test_complete_document_conversion_with_mixed_formats(
+        self, service, make_dynamodb_item
+    ):
         """Test complete document conversion with various data formats."""
-        mock_item = self.create_base_dynamodb_item()
+        mock_item = make_dynamodb_item()
 
         # Add metering as native dict (the problematic case)
         mock_item["Metering"] = {
@@ -145,7 +167,7 @@ class TestDynamoDBServiceDataFormats:
 
         # This should fail with current implementation, but pass after fix
         try:
-            document = self.service._dynamodb_item_to_document(mock_item)
+            document = service._dynamodb_item_to_document(mock_item)
             # If we get here, the fix is working
             assert document.input_key == "lending_package.pdf"
             assert document.status == Status.COMPLETED
@@ -161,9 +183,9 @@ class TestDynamoDBServiceDataFormats:
             else:
                 raise
 
-    def test_identify_all_json_parsing_fields(self):
+    def test_identify_all_json_parsing_fields(self, service, make_dynamodb_item):
         """Identify all fields in the code that might have similar JSON parsing issues."""
-        mock_item = self.create_base_dynamodb_item()
+        mock_item = make_dynamodb_item()
 
         # Test with various field types that might use json.loads()
         test_cases = [
@@ -178,7 +200,7 @@ class TestDynamoDBServiceDataFormats:
 
             # Document which fields cause similar errors
             try:
-                _ = self.service._dynamodb_item_to_document(mock_item_copy)
+                _ = service._dynamodb_item_to_document(mock_item_copy)
                 print(f"Field {field_name}: No error with native dict format")
             except TypeError as e:
                 if "JSON object must be str, bytes or bytearray, not dict" in str(e):
@@ -188,9 +210,9 @@ class TestDynamoDBServiceDataFormats:
             except Exception as e:
                 print(f"Field {field_name}: Other error - {str(e)}")
 
-    def test_decimal_handling_in_native_objects(self):
+    def test_decimal_handling_in_native_objects(self, service, make_dynamodb_item):
         """Test that Decimal values in native objects are handled correctly."""
-        mock_item = self.create_base_dynamodb_item()
+        mock_item = make_dynamodb_item()
         mock_item["Metering"] = {
             "cost": Decimal("12.34"),
             "confidence": Decimal("0.95"),
@@ -199,7 +221,7 @@ class TestDynamoDBServiceDataFormats:
 
         # After fix, this should work
         try:
-            document = self.service._dynamodb_item_to_document(mock_item)
+            document = service._dynamodb_item_to_document(mock_item)
             # Verify Decimal values are preserved or converted appropriately
             assert isinstance(document.metering["cost"], (Decimal, float))
         except TypeError:
@@ -215,9 +237,11 @@ class TestDynamoDBServiceDataFormats:
             ("invalid json", {}),  # Invalid JSON
         ],
     )
-    def test_metering_format_variations(self, metering_value, expected_result):
+    def test_metering_format_variations(
+        self, service, make_dynamodb_item, metering_value, expected_result
+    ):
         """Parameterized test for various metering data formats."""
-        mock_item = self.create_base_dynamodb_item()
+        mock_item = make_dynamodb_item()
         if metering_value is not None:
             mock_item["Metering"] = metering_value
         else:
@@ -226,7 +250,7 @@ class TestDynamoDBServiceDataFormats:
 
         # This test will fail until we implement the fix
         try:
-            document = self.service._dynamodb_item_to_document(mock_item)
+            document = service._dynamodb_item_to_document(mock_item)
             assert document.metering == expected_result
         except TypeError as e:
             if "JSON object must be str, bytes or bytearray, not dict" in str(e):
@@ -241,24 +265,9 @@ class TestDynamoDBServiceDataFormatsFixed:
     These tests validate the robust data format handling.
     """
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.mock_client = Mock()
-        self.service = DocumentDynamoDBService(dynamodb_client=self.mock_client)
-
-    def create_base_item(self):
-        """Create base test item."""
-        return {
-            "PK": "doc#test.pdf",
-            "SK": "none",
-            "ObjectKey": "test.pdf",
-            "ObjectStatus": "COMPLETED",
-            "PageCount": 1,
-        }
-
-    def test_robust_metering_handling_after_fix(self):
+    def test_robust_metering_handling_after_fix(self, service, make_dynamodb_item):
         """Test that the fixed implementation handles all metering formats robustly."""
-        base_item = self.create_base_item()
+        base_item = make_dynamodb_item("test.pdf", page_count=1, include_content=False)
 
         test_cases = [
             # (input_value, expected_output, description)
@@ -275,5 +284,5 @@ class TestDynamoDBServiceDataFormatsFixed:
             if input_val is not None:
                 item["Metering"] = input_val
 
-            document = self.service._dynamodb_item_to_document(item)
+            document = service._dynamodb_item_to_document(item)
             assert document.metering == expected, f"Failed for {desc}: {input_val}"
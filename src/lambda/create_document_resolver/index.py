@@ -5,7 +5,8 @@ import os
 import boto3
 import json
 import logging
-from decimal import Decimal
+from botocore.config import Config
+from botocore.exceptions import ClientError
 from robust_list_deletion import delete_list_entries_robust, calculate_shard
 
 # Configure logging
@@ -14,16 +15,87 @@ logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 logging.getLogger('idp_common.bedrock.client').setLevel(os.environ.get("BEDROCK_LOG_LEVEL", "INFO"))
 # Get LOG_LEVEL from environment variable with INFO as default
 
-dynamodb = boto3.resource('dynamodb')
+# Enable TCP keep-alive (SO_KEEPALIVE) on the client's sockets. Connections are
+# reused across warm invocations through the module-level client's pool; retries
+# keep botocore's DynamoDB defaults
+boto_config = Config(tcp_keepalive=True)
+dynamodb = boto3.resource('dynamodb', config=boto_config)
+TRACKING_TABLE_NAME = os.environ['TRACKING_TABLE_NAME']
+tracking_table = dynamodb.Table(TRACKING_TABLE_NAME)
 
-class DecimalEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return float(obj)
-        return super(DecimalEncoder, self).default(obj)
+# Open the TLS connection to DynamoDB during init so the handshake is not paid
+# by the first request. The key never exists; only the round trip matters.
+try:
+    tracking_table.get_item(Key={'PK': 'warmup#connection', 'SK': 'none'})
+except Exception as e:
+    logger.warning(f"DynamoDB connection warm-up failed: {str(e)}")
+
+def is_document_exists_error(error):
+    """
+    Check whether a conditional create was rejected because the document
+    record already exists.
+    """
+    return error.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException'
+
+def _handle_create_new(object_key, doc_item, list_item):
+    """
+    Create the document record only if it does not exist yet, then add its
+    list entry. Most documents are new, so this avoids a GetItem round trip
+    before every create.
+    """
+    tracking_table.put_item(
+        Item=doc_item,
+        ConditionExpression='attribute_not_exists(PK)'
+    )
+    tracking_table.put_item(Item=list_item)
+    logger.info(f"Successfully created document and list entries for {object_key}")
+
+def _handle_replace(object_key, doc_item, list_item):
+    """
+    Replace a document that already exists (e.g. a file re-uploaded with the
+    same key), removing the list entry of the previous upload first.
+    """
+    logger.info(f"Document {object_key} already exists, replacing it")
+    existing_doc = None
+    try:
+        response = tracking_table.get_item(
+            Key={
+                'PK': doc_item['PK'],
+                'SK': doc_item['SK']
+            }
+        )
+        if 'Item' in response:
+            existing_doc = response['Item']
+            logger.debug("Found existing document with attributes: %s", list(existing_doc))
+    except Exception as e:
+        logger.error(f"Error checking for existing document: {str(e)}")
+        # Continue with creation process even if this check fails
+
+    # If existing document found, delete its list entry using robust deletion
+    if existing_doc:
+        try:
+            logger.info(f"Attempting robust deletion of list entries for existing document: {object_key}")
+            deletion_success = delete_list_entries_robust(tracking_table, object_key, existing_doc)
+
+            if deletion_success:
+                logger.info(f"Successfully deleted existing list entries for {object_key}")
+            else:
+                logger.warning(f"No existing list entries found/deleted for {object_key}")
+        except Exception as e:
+            logger.error(f"Error in robust list entry deletion: {str(e)}")
+            # Continue with creation process even if deletion fails
+
+    # Overwrite both items in a single BatchWriteItem request; the batch writer
+    # resubmits any UnprocessedItems returned by DynamoDB
+    with tracking_table.batch_writer() as batch:
+        batch.put_item(Item=doc_item)
+        batch.put_item(Item=list_item)
+
+    logger.info(f"Successfully replaced document and list entries for {object_key}")
 
 def handler(event, context):
-    logger.info(f"Create document resolver invoked with event: {json.dumps(event)}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Create document resolver invoked with event: %s", json.dumps(event))
     
     try:
         # Extract input data from full AppSync context
@@ -35,6 +107,7 @@ def handler(event, context):
         
         object_key = input_data.get('ObjectKey')
         queued_time = input_data.get('QueuedTime')
+        expires_after = input_data.get('ExpiresAfter')
         
         if not object_key or not isinstance(object_key, str):
             raise ValueError("ObjectKey must be a non-empty string")
@@ -43,80 +116,42 @@ def handler(event, context):
         
         logger.info(f"Processing document: {object_key}, QueuedTime: {queued_time}")
         
-        tracking_table = dynamodb.Table(os.environ['TRACKING_TABLE_NAME'])
-        logger.info(f"Using tracking table: {os.environ['TRACKING_TABLE_NAME']}")
+        logger.info(f"Using tracking table: {TRACKING_TABLE_NAME}")
         
         # Define document key format
         doc_pk = f"doc#{object_key}"
         doc_sk = "none"
         
-        # First check if document already exists
-        logger.info(f"Checking if document {object_key} already exists")
-        existing_doc = None
-        try:
-            response = tracking_table.get_item(
-                Key={
-                    'PK': doc_pk,
-                    'SK': doc_sk
-                }
-            )
-            if 'Item' in response:
-                existing_doc = response['Item']
-                logger.info(f"Found existing document metadata: {json.dumps(existing_doc, cls=DecimalEncoder)}")
-        except Exception as e:
-            logger.error(f"Error checking for existing document: {str(e)}")
-            # Continue with creation process even if this check fails
-        
-        # If existing document found, delete its list entry using robust deletion
-        if existing_doc:
-            try:
-                logger.info(f"Attempting robust deletion of list entries for existing document: {object_key}")
-                deletion_success = delete_list_entries_robust(tracking_table, object_key, existing_doc)
-                
-                if deletion_success:
-                    logger.info(f"Successfully deleted existing list entries for {object_key}")
-                else:
-                    logger.warning(f"No existing list entries found/deleted for {object_key}")
-            except Exception as e:
-                logger.error(f"Error in robust list entry deletion: {str(e)}")
-                # Continue with creation process even if deletion fails
-        
         # Calculate shard ID for new list entry using shared utility
         date_part, shard_str = calculate_shard(queued_time)
         list_pk = f"list#{date_part}#s#{shard_str}"
         list_sk = f"ts#{queued_time}#id#{object_key}"
-        
+
+        list_item = {
+            'PK': list_pk,
+            'SK': list_sk,
+            'ObjectKey': object_key,
+            'QueuedTime': queued_time
+        }
+        # Only set the TTL attribute when one was supplied rather than storing a NULL
+        if expires_after is not None:
+            list_item['ExpiresAfter'] = expires_after
+        # The input is not used after this point, so key it in place as the
+        # document item rather than copying it into a new dict
+        input_data['PK'] = doc_pk
+        input_data['SK'] = doc_sk
+        doc_item = input_data
+
         logger.info(f"Creating document entries with doc_pk={doc_pk}, list_pk={list_pk}")
-        
-        # Create both items directly using the resource interface instead of transactions
+
         try:
-            # Create the document record
-            logger.info(f"Creating document record: PK={doc_pk}, SK={doc_sk}")
-            tracking_table.put_item(
-                Item={
-                    'PK': doc_pk,
-                    'SK': doc_sk,
-                    **input_data
-                }
-            )
-            
-            # Create the list item
-            logger.info(f"Creating list item: PK={list_pk}, SK={list_sk}")
-            tracking_table.put_item(
-                Item={
-                    'PK': list_pk,
-                    'SK': list_sk,
-                    'ObjectKey': object_key,
-                    'QueuedTime': queued_time,
-                    'ExpiresAfter': input_data.get('ExpiresAfter')
-                }
-            )
-            
-            logger.info(f"Successfully created document and list entries for {object_key}")
-        except Exception as e:
-            logger.error(f"Error creating document entries: {str(e)}")
-            raise e
-        
+            _handle_create_new(object_key, doc_item, list_item)
+        except ClientError as e:
+            if not is_document_exists_error(e):
+                logger.error(f"Error creating document entries: {str(e)}")
+                raise e
+            _handle_replace(object_key, doc_item, list_item)
+
         return {"ObjectKey": object_key}
     except Exception as e:
         logger.error(f"Error in create_document resolver: {str(e)}", exc_info=True)
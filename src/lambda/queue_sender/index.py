@@ -7,6 +7,7 @@ import os
 import json
 from datetime import datetime, timezone, timedelta
 import logging
+from botocore.config import Config
 from idp_common.models import Document, Status
 from idp_common.docs_service import create_document_service
 
@@ -16,39 +17,51 @@ logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 logging.getLogger('idp_common.bedrock.client').setLevel(os.environ.get("BEDROCK_LOG_LEVEL", "INFO"))
 # Get LOG_LEVEL from environment variable with INFO as default
 
-# Initialize clients
-sqs = boto3.client('sqs')
+# Initialize clients. TCP keep-alive (SO_KEEPALIVE) is enabled on the SQS client's
+# sockets; connections are reused across warm invocations through the module-level
+# client's pool, and retries keep botocore's SQS defaults
+boto_config = Config(tcp_keepalive=True)
+sqs = boto3.client('sqs', config=boto_config)
 document_service = create_document_service()
 queue_url = os.environ['QUEUE_URL']
 retentionDays = int(os.environ['DATA_RETENTION_IN_DAYS'])
+retention_period = timedelta(days=retentionDays)
+
+# Open the TLS connection to SQS during init so the handshake is not paid by
+# the first S3 event
+try:
+    sqs.get_queue_attributes(QueueUrl=queue_url, AttributeNames=['QueueArn'])
+except Exception as e:
+    logger.warning(f"SQS connection warm-up failed: {str(e)}")
+
+# Output bucket for the document, validated once at init
+output_bucket = os.environ.get('OUTPUT_BUCKET', '')
+if output_bucket == '':
+    raise Exception("OUTPUT_BUCKET environment variable not set")
 
 def handler(event, context):
-    logger.info(f"Processing event: {json.dumps(event)}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Processing event: %s", json.dumps(event))
     
     detail = event['detail']
     object_key = detail['object']['key']
-    logger.info(f"Processing file: {object_key}")
-    
-    # Get output bucket from environment for the document
-    output_bucket = os.environ.get('OUTPUT_BUCKET', '')
-    if output_bucket == '':
-        raise Exception("OUTPUT_BUCKET environment variable not set")
+    logger.info("Processing file: %s", object_key)
     
-    # Create document object
-    current_time = datetime.now(timezone.utc).isoformat()
+    # Create document object; the queued time and expiry share one clock read
+    now = datetime.now(timezone.utc)
     document = Document.from_s3_event(event, output_bucket)
     document.status = Status.QUEUED
-    document.queued_time = current_time
+    document.queued_time = now.isoformat()
     
     # Calculate expiry date
-    expires_after = int((datetime.now(timezone.utc) + timedelta(days=retentionDays)).timestamp())
+    expires_after = int((now + retention_period).timestamp())
 
     # Create document in DynamoDB via document service
-    logger.info(f"Creating document via document service: {document.input_key}")
+    logger.info("Creating document via document service: %s", document.input_key)
     
     # Create document in document service with TTL
     created_key = document_service.create_document(document, expires_after=expires_after)
-    logger.info(f"Document created with key: {created_key}")
+    logger.info("Document created with key: %s", created_key)
     
     # Send serialized document to SQS queue
     doc_json = document.to_json()
@@ -66,8 +79,8 @@ def handler(event, context):
             }
         }
     }
-    logger.info(f"Sending document to SQS queue: {object_key}")
+    logger.info("Sending document to SQS queue: %s", object_key)
     response = sqs.send_message(**message)
-    logger.info(f"SQS response: {response}")
+    logger.info("SQS response: %s", response)
     
     return {'statusCode': 200, 'detail': detail, 'document_id': document.id}
\ No newline at end of file
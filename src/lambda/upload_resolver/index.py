@@ -21,6 +21,17 @@ s3_config = Config(
 )
 s3_client = boto3.client('s3', config=s3_config)
 
+# Fallback bucket for legacy pattern usage that relies on INPUT_BUCKET
+input_bucket = os.environ.get('INPUT_BUCKET')
+
+# Presigned POST limits: 1 Byte to 100 MB, valid for 15 minutes
+MAX_UPLOAD_BYTES = 104857600
+PRESIGNED_POST_EXPIRES_IN = 900
+CONTENT_LENGTH_CONDITION = ['content-length-range', 1, MAX_UPLOAD_BYTES]
+
+# Characters replaced in uploaded file names to avoid URL encoding issues
+FILE_NAME_TRANSLATION = str.maketrans({' ': '_', '\t': '_', '#': '_', '?': '_'})
+
 def handler(event, context):
     """
     Generates a presigned POST URL for S3 uploads through an AppSync resolver.
@@ -32,14 +43,16 @@ def handler(event, context):
     Returns:
         dict: A dictionary containing the presigned URL data and object key
     """
-    logger.info(f"Received event: {json.dumps(event)}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Received event: %s", json.dumps(event))
     
     try:
         # Extract variables from the event
         arguments = event.get('arguments', {})
         file_name = arguments.get('fileName')
         content_type = arguments.get('contentType', 'application/octet-stream')
-        prefix = arguments.get('prefix', '')
+        # Strip surrounding slashes so a prefix like 'invoices/2024/' doesn't yield '//'
+        prefix = (arguments.get('prefix') or '').strip('/')
         
         if not file_name:
             raise ValueError("fileName is required")
@@ -47,24 +60,21 @@ def handler(event, context):
         # Get bucket from arguments or fallback to INPUT_BUCKET if needed by patterns
         bucket_name = arguments.get('bucket')
         
-        if not bucket_name and os.environ.get('INPUT_BUCKET'):
+        if not bucket_name and input_bucket:
             # Support legacy pattern usage that relies on INPUT_BUCKET
-            bucket_name = os.environ.get('INPUT_BUCKET')
-            logger.info(f"Using INPUT_BUCKET fallback: {bucket_name}")
+            bucket_name = input_bucket
+            logger.info("Using INPUT_BUCKET fallback: %s", bucket_name)
         elif not bucket_name:
             raise ValueError("bucket parameter is required when INPUT_BUCKET is not configured")
         
         # Sanitize file name to avoid URL encoding issues
-        sanitized_file_name = file_name.replace(' ', '_')
+        sanitized_file_name = file_name.translate(FILE_NAME_TRANSLATION)
         
         # Build the object key - only use prefix if provided
-        if prefix:
-            object_key = f"{prefix}/{sanitized_file_name}"
-        else:
-            object_key = sanitized_file_name
+        object_key = f"{prefix}/{sanitized_file_name}" if prefix else sanitized_file_name
         
         # Generate a presigned POST URL for uploading
-        logger.info(f"Generating presigned POST data for: {object_key} with content type: {content_type}")
+        logger.info("Generating presigned POST data for: %s with content type: %s", object_key, content_type)
         
         presigned_post = s3_client.generate_presigned_post(
             Bucket=bucket_name,
@@ -72,18 +82,22 @@ def handler(event, context):
             Fields={
                 'Content-Type': content_type
             },
+            # botocore appends the bucket and key conditions to this list, so
+            # it is built per call around the shared length condition
             Conditions=[
-                ['content-length-range', 1, 104857600],  # 1 Byte to 100 MB
+                CONTENT_LENGTH_CONDITION,
                 {'Content-Type': content_type}
             ],
-            ExpiresIn=900  # 15 minutes
+            ExpiresIn=PRESIGNED_POST_EXPIRES_IN
         )
         
-        logger.info(f"Generated presigned POST data: {json.dumps(presigned_post)}")
+        # Encode once, compactly, for both the log line and the response
+        presigned_post_json = json.dumps(presigned_post, separators=(',', ':'))
+        logger.info("Generated presigned POST data: %s", presigned_post_json)
         
         # Return the presigned POST data and object key
         return {
-            'presignedUrl': json.dumps(presigned_post),
+            'presignedUrl': presigned_post_json,
             'objectKey': object_key,
             'usePostMethod': True
         }